@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
 import threading
 import time
 import os
@@ -15,11 +15,23 @@ init(autoreset=True)
 app = Flask(__name__)
 app.secret_key = 'your_secret_key'  # Replace with a real secret key
 
+# Maximum number of shareable strings accepted by a single batch verification
+MAX_BATCH_SIZE = 1000
+
 class MerkleTree:
     def __init__(self, data):
-        self.leaves = [hashlib.sha256(str(item).encode()).hexdigest() for item in data]
+        self.leaves = [self.hash_leaf(item) for item in data]
         self.tree = self.build_merkle_tree(self.leaves)
 
+    @staticmethod
+    def hash_leaf(item):
+        return hashlib.sha256(str(item).encode()).hexdigest()
+
+    @staticmethod
+    def hash_node(left, right):
+        combined = left + right
+        return hashlib.sha256(combined.encode()).hexdigest()
+
     def build_merkle_tree(self, leaves):
         if len(leaves) == 1:
             return leaves
@@ -27,13 +39,54 @@ class MerkleTree:
         for i in range(0, len(leaves), 2):
             left = leaves[i]
             right = leaves[i + 1] if i + 1 < len(leaves) else leaves[i]
-            combined = left + right
-            new_level.append(hashlib.sha256(combined.encode()).hexdigest())
+            new_level.append(self.hash_node(left, right))
         return self.build_merkle_tree(new_level) + new_level
 
     def get_merkle_root(self):
         return self.tree[-1] if self.tree else None
 
+class PrefixMerkleTree:
+    # Holds every level of the tree over the longest chain, so the root of any
+    # shorter prefix reuses its complete left subtrees instead of rebuilding them
+    def __init__(self, data):
+        level = [MerkleTree.hash_leaf(item) for item in data]
+        self.levels = [level]
+        while len(level) > 1:
+            new_level = []
+            for i in range(0, len(level), 2):
+                left = level[i]
+                right = level[i + 1] if i + 1 < len(level) else level[i]
+                new_level.append(MerkleTree.hash_node(left, right))
+            self.levels.append(new_level)
+            level = new_level
+
+    def __len__(self):
+        return len(self.levels[0])
+
+    def right_edge(self, length):
+        if not 1 <= length <= len(self):
+            raise ValueError(f"Prefix length {length} is outside the tree of {len(self)} leaves.")
+
+        # Only the last node of each level differs from the full tree, so walk
+        # up the right edge hashing one node per level
+        edge = [self.levels[0][length - 1]]
+        level = 0
+        size = length
+        while size > 1:
+            if size % 2 == 0:
+                edge.append(MerkleTree.hash_node(self.levels[level][size - 2], edge[-1]))
+            else:
+                edge.append(MerkleTree.hash_node(edge[-1], edge[-1]))
+            level += 1
+            size = (size + 1) // 2
+        return edge
+
+    def get_merkle_root(self, length):
+        # Same value as MerkleTree(data[:length]).get_merkle_root(), whose tree
+        # ends with the first level above the leaves
+        edge = self.right_edge(length)
+        return edge[1] if len(edge) > 1 else edge[0]
+
 class PrimeMiner:
     def __init__(self):
         self.primes_list = []
@@ -129,9 +182,14 @@ class PrimeMiner:
             print(Fore.RED + f"Error parsing shareable string: {e}")
             return None, None, None
 
-    def verify_chain(self, external_most_recent_prime, external_primes_found, external_merkle_root):
+    def verify_chain(self, external_most_recent_prime, external_primes_found, external_merkle_root, prefix_tree=None):
+        if external_primes_found < 1:
+            print(Fore.RED + "Provided chain length must be positive.")
+            return False
+
         # Ensure the length of the chain to verify is less than or equal to our chain length
-        if external_primes_found > self.primes_found:
+        primes_found = len(prefix_tree) if prefix_tree is not None else self.primes_found
+        if external_primes_found > primes_found:
             print(Fore.RED + "Provided chain length is longer than our chain.")
             return False
 
@@ -141,15 +199,52 @@ class PrimeMiner:
             return False
 
         # Verify the Merkle root for the length of the provided chain
-        partial_chain = self.primes_list[:external_primes_found]
-        merkle_tree = MerkleTree(partial_chain)
-        calculated_merkle_root = merkle_tree.get_merkle_root()
+        if prefix_tree is not None:
+            calculated_merkle_root = prefix_tree.get_merkle_root(external_primes_found)
+        else:
+            partial_chain = self.primes_list[:external_primes_found]
+            merkle_tree = MerkleTree(partial_chain)
+            calculated_merkle_root = merkle_tree.get_merkle_root()
         if calculated_merkle_root != external_merkle_root:
             print(Fore.RED + "Merkle root mismatch.")
             return False
 
         return True
 
+    def verify_chains(self, encoded_strings):
+        parsed = [(encoded_string, self.parse_shareable_string(encoded_string)) for encoded_string in encoded_strings]
+
+        # Build one tree over the longest chain we can verify; any string longer
+        # than it is also longer than our chain and gets rejected as such
+        chain_length = self.primes_found
+        longest = max((chain[1] for _, chain in parsed if chain[0] is not None and chain[1] <= chain_length), default=0)
+        prefix_tree = PrefixMerkleTree(self.primes_list[:max(longest, 0)])
+
+        results = []
+        verified = {}
+        for encoded_string, chain in parsed:
+            most_recent_prime, primes_found, merkle_root = chain
+            if most_recent_prime is None:
+                result = 'error'
+            elif chain in verified:
+                result = verified[chain]
+            else:
+                try:
+                    valid = self.verify_chain(most_recent_prime, primes_found, merkle_root, prefix_tree)
+                    result = 'valid' if valid else 'invalid'
+                except Exception as e:
+                    print(Fore.RED + f"Error verifying shareable string: {e}")
+                    result = 'error'
+                verified[chain] = result
+            results.append({
+                'encoded_string': encoded_string,
+                'result': result,
+                'most_recent_prime': most_recent_prime,
+                'primes_found': primes_found,
+                'merkle_root': merkle_root,
+            })
+        return results
+
 # Create a PrimeMiner instance
 miner = PrimeMiner()
 
@@ -184,6 +279,22 @@ def verify_chain():
     
     return render_template('verify.html', result=result, most_recent_prime=most_recent_prime, primes_found=primes_found, merkle_root=merkle_root)
 
+@app.route('/api/verify/batch', methods=['POST'])
+def verify_chain_batch():
+    data = request.get_json(silent=True)
+    encoded_strings = data.get('encoded_strings') if isinstance(data, dict) else None
+    if not isinstance(encoded_strings, list) or not all(isinstance(item, str) for item in encoded_strings):
+        return jsonify({'error': "Expected a JSON body with an 'encoded_strings' list."}), 400
+    if len(encoded_strings) > MAX_BATCH_SIZE:
+        return jsonify({'error': f"At most {MAX_BATCH_SIZE} shareable strings can be verified per request."}), 400
+
+    results = miner.verify_chains(encoded_strings)
+    return jsonify({
+        'results': results,
+        'valid': sum(1 for item in results if item['result'] == 'valid'),
+        'invalid': sum(1 for item in results if item['result'] == 'invalid'),
+        'errors': sum(1 for item in results if item['result'] == 'error'),
+    })
 
 if __name__ == "__main__":
     app.run(host='0.0.0.0', port=5000)
@@ -0,0 +1,131 @@
+import base64
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Compares batch verification with one call per string on a generated chain and
+# times both. Usage: python check_batch_verify.py [limit], where the chain holds
+# every prime below limit.
+
+# Run the miners in a scratch directory so the real primes.csv is left alone
+os.chdir(tempfile.mkdtemp())
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app
+import fatest_prime_miner
+
+
+def encode(*parts):
+    return base64.b64encode(':'.join(map(str, parts)).encode()).decode()
+
+
+def single_result(parse, verify, encoded_string):
+    chain = parse(encoded_string)
+    if chain[0] is None:
+        return 'error'
+    try:
+        return 'valid' if verify(*chain) else 'invalid'
+    except Exception:
+        return 'error'
+
+
+def app_strings(primes):
+    strings = []
+    lengths = [1, 2, 3, len(primes)] + random.sample(range(4, len(primes)), 20)
+    for length in lengths:
+        root = app.MerkleTree(primes[:length]).get_merkle_root()
+        strings.append(encode(primes[length - 1], length, root))
+        # Wrong Merkle root and wrong most recent prime
+        strings.append(encode(primes[length - 1], length, root[::-1]))
+        strings.append(encode(primes[length - 1] + 1, length, root))
+    # Chains longer than ours, non-positive lengths and undecodable strings
+    strings.append(encode(primes[-1], len(primes) + 1, 'root'))
+    strings.append(encode(primes[-1], len(primes) + 1000, 'root'))
+    strings.append(encode(primes[-1], 0, 'root'))
+    strings.append(encode(primes[-1], -5, 'root'))
+    strings.append('not base64!!')
+    strings.append(encode('a', 'b'))
+    # Duplicates, including an equivalent encoding with trailing whitespace
+    strings.append(strings[0])
+    strings.append(strings[6] + '\n')
+    return strings
+
+
+def fatest_strings(primes):
+    strings = []
+    for length in [50, 51, len(primes)] + random.sample(range(52, len(primes)), 150):
+        root = fatest_prime_miner.MerkleTree(primes[length - 50:length]).get_merkle_root()
+        strings.append(encode(length, root))
+        strings.append(encode(length, root[::-1]))
+    # Windows that start before the chain, run past its end or cannot be decoded
+    strings.append(encode(10, 'root'))
+    strings.append(encode(0, 'root'))
+    strings.append(encode(len(primes) + 10, 'root'))
+    strings.append('not base64!!')
+    strings.append(strings[0])
+    strings.append(strings[4] + '\n')
+    return strings
+
+
+def compare(name, strings, single, batch):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        expected = [single(encoded_string) for encoded_string in strings]
+        single_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = [item['result'] for item in batch(strings)]
+        batch_time = time.perf_counter() - start
+
+    mismatches = [i for i, (want, got) in enumerate(zip(expected, results)) if want != got]
+    counts = ', '.join(f"{label}: {expected.count(label)}" for label in ('valid', 'invalid', 'error'))
+    print(f"{name}: {len(strings)} strings ({counts})")
+    print(f"  single calls {single_time:.2f}s, batch {batch_time:.2f}s, {single_time / batch_time:.1f}x faster")
+    for i in mismatches:
+        print(f"  mismatch for {strings[i]!r}: single {expected[i]}, batch {results[i]}")
+    return not mismatches
+
+
+def main():
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    random.seed(0)
+
+    web_miner = app.miner
+    web_miner.stop_event.set()
+    web_miner.mining_thread.join()
+    primes = web_miner.sieve_of_eratosthenes(0, limit)
+    web_miner.primes_list = primes
+    web_miner.primes_found = len(primes)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli_miner = fatest_prime_miner.PrimeMiner()
+        cli_miner.stop_mining()
+    cli_miner.primes_list = primes
+    cli_miner.primes_found = len(primes)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        web_strings = app_strings(primes)
+        cli_strings = fatest_strings(primes)
+
+    print(f"Chain of {len(primes)} primes below {limit}")
+    app_ok = compare(
+        'app.py', web_strings,
+        lambda s: single_result(web_miner.parse_shareable_string, web_miner.verify_chain, s),
+        web_miner.verify_chains,
+    )
+    fatest_ok = compare(
+        'fatest_prime_miner.py', cli_strings,
+        lambda s: single_result(cli_miner.parse_shareable_string, cli_miner.verify_chain, s),
+        cli_miner.verify_shareable_strings,
+    )
+    if not (app_ok and fatest_ok):
+        sys.exit(1)
+    print("Batch results match single calls.")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,40 +12,74 @@ from concurrent.futures import ThreadPoolExecutor
 # Initialize colorama
 init(autoreset=True)
 
+class MerkleHashCache:
+    # Shares leaf, node and root hashes between trees built over overlapping ranges
+    def __init__(self):
+        self.leaves = {}
+        self.nodes = {}
+        self.roots = {}
+
+    def hash_leaf(self, item):
+        digest = self.leaves.get(item)
+        if digest is None:
+            digest = hashlib.sha256(str(item).encode()).hexdigest()
+            self.leaves[item] = digest
+        return digest
+
+    def hash_node(self, left, right):
+        key = (left, right)
+        digest = self.nodes.get(key)
+        if digest is None:
+            digest = hashlib.sha256((left + right).encode()).hexdigest()
+            self.nodes[key] = digest
+        return digest
+
 class MerkleTree:
-    def __init__(self, data):
-        self.leaves = [hashlib.sha256(str(item).encode()).hexdigest() for item in data]
+    def __init__(self, data, cache=None):
+        self.cache = cache
+        self.leaves = [self.hash_leaf(item) for item in data]
         self.tree = []
         self.build_merkle_tree(self.leaves)
 
-    def build_merkle_tree(self, leaves):
-        def hash_pair(left, right):
-            combined = left + right
-            return hashlib.sha256(combined.encode()).hexdigest()
+    def hash_leaf(self, item):
+        if self.cache is not None:
+            return self.cache.hash_leaf(item)
+        return hashlib.sha256(str(item).encode()).hexdigest()
 
+    def hash_node(self, left, right):
+        if self.cache is not None:
+            return self.cache.hash_node(left, right)
+        combined = left + right
+        return hashlib.sha256(combined.encode()).hexdigest()
+
+    def build_merkle_tree(self, leaves):
         level_count = int(log2(len(leaves))) + 1
         num_levels = level_count
         current_level = leaves
         self.tree = [current_level]
 
         while len(current_level) > 1:
-            new_level = []
-            with ThreadPoolExecutor() as executor:
-                futures = []
-                for i in range(0, len(current_level), 2):
-                    left = current_level[i]
-                    right = current_level[i + 1] if i + 1 < len(current_level) else left
-                    futures.append(executor.submit(hash_pair, left, right))
-                
-                for future in futures:
-                    new_level.append(future.result())
+            pairs = []
+            for i in range(0, len(current_level), 2):
+                left = current_level[i]
+                right = current_level[i + 1] if i + 1 < len(current_level) else left
+                pairs.append((left, right))
+
+            if self.cache is not None:
+                # Cached hashes are mostly lookups, so a thread pool would only add overhead
+                new_level = [self.hash_node(left, right) for left, right in pairs]
+            else:
+                with ThreadPoolExecutor() as executor:
+                    futures = [executor.submit(self.hash_node, left, right) for left, right in pairs]
+                    new_level = [future.result() for future in futures]
 
             self.tree.append(new_level)
             current_level = new_level
 
             # Display progress
-            progress = (len(self.tree) - 1) / num_levels * 100
-            print(f"Building Merkle Tree: {int(progress)}% done", end='\r')
+            if self.cache is None:
+                progress = (len(self.tree) - 1) / num_levels * 100
+                print(f"Building Merkle Tree: {int(progress)}% done", end='\r')
 
     def get_merkle_root(self):
         return self.tree[-1][0] if self.tree else None
@@ -176,25 +210,64 @@ class PrimeMiner:
             print(Fore.RED + f"Error parsing shareable string: {e}")
             return None, None
 
+    def calculate_merkle_root(self, start, end, cache=None):
+        if cache is None:
+            return MerkleTree(self.primes_list[start:end]).get_merkle_root()
+        # Strings claiming the same range only need their tree built once
+        key = (start, end)
+        if key not in cache.roots:
+            cache.roots[key] = MerkleTree(self.primes_list[start:end], cache).get_merkle_root()
+        return cache.roots[key]
+
+    def verify_chain(self, external_primes_found, external_merkle_root, cache=None):
+        # Verify the Merkle root for the last 50 primes
+        calculated_merkle_root = self.calculate_merkle_root(external_primes_found-50, external_primes_found, cache)
+        if calculated_merkle_root != external_merkle_root:
+            print(Fore.RED + f"Merkle root mismatch. Expected: {external_merkle_root}, Calculated: {calculated_merkle_root}")
+            return False
+
+        return True
+
     def verify_shareable_string(self, encoded_string):
         try:
             primes_found, merkle_root = self.parse_shareable_string(encoded_string)
             if primes_found is None:
                 return False
-
-            # Verify the Merkle root for the last 50 primes
-            last_50_primes = self.primes_list[primes_found-50:primes_found]
-            merkle_tree = MerkleTree(last_50_primes)
-            calculated_merkle_root = merkle_tree.get_merkle_root()
-            if calculated_merkle_root != merkle_root:
-                print(Fore.RED + f"Merkle root mismatch. Expected: {merkle_root}, Calculated: {calculated_merkle_root}")
-                return False
-
-            return True
+            return self.verify_chain(primes_found, merkle_root)
         except Exception as e:
             print(Fore.RED + f"Error verifying shareable string: {e}")
             return False
 
+    def verify_shareable_strings(self, encoded_strings):
+        cache = MerkleHashCache()
+        parsed = [(encoded_string, self.parse_shareable_string(encoded_string)) for encoded_string in encoded_strings]
+
+        # Verify overlapping windows next to each other so they reuse leaf and node hashes
+        order = sorted(range(len(parsed)), key=lambda i: parsed[i][1][0] or 0)
+        results = [None] * len(parsed)
+        verified = {}
+        for i in order:
+            encoded_string, chain = parsed[i]
+            primes_found, merkle_root = chain
+            if primes_found is None:
+                result = 'error'
+            elif chain in verified:
+                result = verified[chain]
+            else:
+                try:
+                    result = 'valid' if self.verify_chain(primes_found, merkle_root, cache) else 'invalid'
+                except Exception as e:
+                    print(Fore.RED + f"Error verifying shareable string: {e}")
+                    result = 'error'
+                verified[chain] = result
+            results[i] = {
+                'encoded_string': encoded_string,
+                'result': result,
+                'primes_found': primes_found,
+                'merkle_root': merkle_root,
+            }
+        return results
+
     def clear_screen(self):
         # Clear the terminal screen
         os.system('cls' if os.name == 'nt' else 'clear')
@@ -213,7 +286,8 @@ class PrimeMiner:
         print(Fore.CYAN + "1. Display Stats")
         print(Fore.CYAN + "2. Share Chain")
         print(Fore.CYAN + "3. Load and Verify Chain")
-        print(Fore.CYAN + "4. Exit")
+        print(Fore.CYAN + "4. Verify Batch of Chains")
+        print(Fore.CYAN + "5. Exit")
         print(Style.RESET_ALL)
 
     def run(self):
@@ -248,6 +322,26 @@ class PrimeMiner:
                 getpass.getpass(prompt="Press Enter to continue...")
 
             elif choice == "4":
+                print(Fore.YELLOW + "Paste the shareable strings, one per line, followed by an empty line:")
+                encoded_strings = []
+                while True:
+                    line = input().strip()
+                    if not line:
+                        break
+                    encoded_strings.append(line)
+                results = self.verify_shareable_strings(encoded_strings)
+                for index, item in enumerate(results, start=1):
+                    if item['result'] == 'valid':
+                        print(Fore.GREEN + f"{index}. Chain is valid. Primes Found: {item['primes_found']}")
+                    elif item['result'] == 'invalid':
+                        print(Fore.RED + f"{index}. Chain verification failed. Primes Found: {item['primes_found']}")
+                    else:
+                        print(Fore.RED + f"{index}. Error decoding or invalid shareable string.")
+                valid_count = sum(1 for item in results if item['result'] == 'valid')
+                print(Fore.CYAN + f"{valid_count} of {len(results)} chains are valid.")
+                getpass.getpass(prompt="Press Enter to continue...")
+
+            elif choice == "5":
                 print(Fore.GREEN + "Exiting...")
                 self.stop_event.set()
                 self.process.join()